@@ -3,9 +3,11 @@ Python to Browser App - Training Tool
 A simple Streamlit application that reads Excel data, processes it, and displays charts.
 """
 
+import numpy as np
 import streamlit as st
-import pandas as pd
+import polars as pl
 import plotly.express as px
+import plotly.graph_objects as go
 from pathlib import Path
 
 # -----------------------------
@@ -57,125 +59,349 @@ st.markdown(
 # File path
 excel_file = Path("data.xlsx")
 
+# Part of the Parquet copy's file name; bump it whenever clean_types changes
+# the columns or dtypes it produces, so copies written by older code are ignored
+PARQUET_CACHE_VERSION = 2
+
+# Most points the daily trend chart sends to the browser
+MAX_TREND_POINTS = 2000
+
+# Rows per page in the data preview
+PREVIEW_PAGE_SIZE = 100
+
 # -----------------------------
 # Function to load data
 # -----------------------------
-@st.cache_data
-def load_data(file_path):
-    """Load data from Excel file"""
+def normalize_columns(df):
+    """Normalize column names (prevents KeyError like 'Date ')"""
+    rename_map = {}
+    for c in df.columns:
+        name = str(c).strip()
+        if name.lower() == "date":
+            rename_map[c] = "Date"
+        elif name.lower() == "units":
+            rename_map[c] = "Units"
+        elif name.lower() in ["unitprice", "unit price"]:
+            rename_map[c] = "UnitPrice"
+        elif name.lower() == "product":
+            rename_map[c] = "Product"
+        elif name.lower() == "region":
+            rename_map[c] = "Region"
+        elif name != c:
+            rename_map[c] = name
+
+    return df.rename(rename_map)
+
+
+def clean_types(df):
+    """Standardize column types and (re)calculate Revenue"""
+    missing = [c for c in ["Date", "Product", "Region", "Units", "UnitPrice"] if c not in df.columns]
+    if missing:
+        raise pl.exceptions.ColumnNotFoundError(", ".join(missing))
+
+    # Excel dates usually arrive typed; text dates are parsed, bad values become null.
+    # Dates are kept as day precision (4-byte date32) and the numbers as float32:
+    # half the bytes for every filter/aggregate scan
+    if df.schema["Date"] == pl.String:
+        date_expr = pl.col("Date").str.to_datetime(strict=False).dt.date()
+    else:
+        date_expr = pl.col("Date").cast(pl.Date, strict=False)
+
+    units = pl.col("Units").cast(pl.Float32, strict=False)
+    unit_price = pl.col("UnitPrice").cast(pl.Float32, strict=False)
+
+    # One with_columns pass: casts of already-typed columns are no-ops, and
+    # Revenue is always calculated (even if already exists) from the cast values
+    df = df.with_columns(
+        date_expr,
+        units,
+        unit_price,
+        pl.col("Product").cast(pl.String),
+        pl.col("Region").cast(pl.String),
+        (units * unit_price).alias("Revenue"),
+    )
+
+    # Drop fully invalid rows early (keeps filters stable); drop_nulls checks
+    # all five columns in one fused pass
+    df = df.drop_nulls(subset=["Date", "Product", "Region", "Units", "UnitPrice"])
+
+    # Low-cardinality labels become sorted Enums: the filter options come straight
+    # from the dtype and is_in compares small integer codes instead of strings
+    return df.with_columns(
+        pl.col(c).cast(pl.Enum(df[c].unique().sort())) for c in ["Region", "Product"]
+    )
+
+
+def has_clean_schema(df):
+    """Check that df has the columns and dtypes clean_types produces"""
+    schema = df.schema
+    return (
+        schema.get("Date") == pl.Date
+        and all(schema.get(c) == pl.Float32 for c in ["Units", "UnitPrice", "Revenue"])
+        and all(isinstance(schema.get(c), pl.Enum) for c in ["Region", "Product"])
+    )
+
+
+def source_stamp(file_path):
+    """Exact (mtime_ns, size) of the workbook, or None when it is missing"""
     try:
-        df = pd.read_excel(file_path)
+        stat = Path(file_path).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def parquet_copy_path(file_path, xlsx_stamp):
+    """Path of the Parquet copy for this exact version of the workbook"""
+    mtime_ns, size = xlsx_stamp
+    return file_path.with_name(
+        f"{file_path.stem}.v{PARQUET_CACHE_VERSION}-{mtime_ns}-{size}.parquet"
+    )
+
+
+def remove_parquet_copies(file_path, keep=None):
+    """Delete the Parquet copies of file_path, except keep"""
+    file_path = Path(file_path)
+    for path in file_path.parent.glob(f"{file_path.stem}.v*.parquet"):
+        if path != keep:
+            try:
+                path.unlink()
+            except OSError:
+                pass  # read-only folder or already gone
+
+
+def read_parquet_copy(parquet_path):
+    """Return the Parquet copy if it exists and has the current schema, else None"""
+    if not parquet_path.exists():
+        return None
+
+    try:
+        df = pl.read_parquet(parquet_path, memory_map=True)
+    except (OSError, pl.exceptions.PolarsError):
+        return None  # unreadable copy: re-parse the workbook instead
+
+    return df if has_clean_schema(df) else None
+
+
+# The loaded frame and the filtered views are kept with st.cache_resource:
+# Polars frames are immutable, so every rerun can share the same objects
+# instead of unpickling a fresh copy the way st.cache_data does
+@st.cache_resource(max_entries=1)
+def load_data(file_path, xlsx_stamp):
+    """Load data from Excel file (via a Parquet copy when it is up to date)
+
+    xlsx_stamp is the workbook's (mtime_ns, size) from source_stamp; it keys
+    both this cache and the Parquet copy's file name, so any replaced or
+    edited data.xlsx (even one with an older mtime) is parsed again.
+    """
+    try:
+        file_path = Path(file_path)
+        if xlsx_stamp is None:
+            raise FileNotFoundError(file_path)
+
+        # Only a copy written from exactly this workbook version is reused
+        parquet_path = parquet_copy_path(file_path, xlsx_stamp)
+        df = read_parquet_copy(parquet_path)
+        if df is not None:
+            return df, None
+
+        # calamine (Rust, via fastexcel) hands back typed Arrow columns directly
+        df = pl.read_excel(file_path, engine="calamine")
+        df = clean_types(normalize_columns(df))
+
+        try:
+            df.write_parquet(parquet_path, compression="zstd", statistics=True)
+        except OSError:
+            pass  # read-only folder: still works, just without the on-disk copy
+        remove_parquet_copies(file_path, keep=parquet_path)
+
         return df, None
     except FileNotFoundError:
         return None, "Error: data.xlsx not found. Please ensure the file exists in the project folder."
+    except pl.exceptions.ColumnNotFoundError as e:
+        return None, f"Error: required column missing from data.xlsx ({e})"
     except Exception as e:
         return None, f"Error loading file: {str(e)}"
 
+def lttb_indices(x, y, n_out):
+    """Pick n_out row indices with Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+
+        # Keep the point in this bucket that forms the largest triangle
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+
+    return keep
+
+
+@st.cache_resource(max_entries=32)
+def compute_views(file_path, xlsx_stamp, region_tuple, product_tuple, start, end):
+    """Filter the loaded data and build the KPI, chart and preview frames"""
+    df, _ = load_data(file_path, xlsx_stamp)
+
+    # Apply filters safely as one combined mask on df (no copy of the frame);
+    # an empty selection matches nothing, so skip building the column checks
+    if region_tuple and product_tuple:
+        # Selections are built as Enum values up front, so is_in matches on
+        # the integer codes without converting strings per query
+        region_values = pl.Series(region_tuple, dtype=df.schema["Region"]).implode()
+        product_values = pl.Series(product_tuple, dtype=df.schema["Product"]).implode()
+        mask = pl.col("Region").is_in(region_values) & pl.col("Product").is_in(product_values)
+    else:
+        mask = pl.lit(False)
+
+    if start is not None and end is not None:
+        mask = mask & pl.col("Date").is_between(start, end)
+
+    # No null check needed here: load_data already dropped rows missing any
+    # key value, and Revenue is only null when Units or UnitPrice is
+    base = df.lazy().filter(mask)
+
+    # Build every aggregate off the same filtered plan and run them in one
+    # collect_all call, so the filter scan is shared and the group-bys run in parallel.
+    # Sums accumulate in float64 so large totals keep their precision
+    q_prod = (
+        base.group_by("Product")
+        .agg(pl.col("Revenue").cast(pl.Float64).sum())
+        .sort("Revenue", descending=True)
+    )
+    q_reg = (
+        base.group_by("Region")
+        .agg(pl.col("Revenue").cast(pl.Float64).sum())
+        .sort("Revenue", descending=True)
+    )
+    q_day = (
+        base.group_by("Date")
+        .agg(pl.col("Revenue").cast(pl.Float64).sum())
+        .sort("Date")
+    )
+    q_kpi = base.select(
+        pl.col("Revenue").cast(pl.Float64).sum().alias("tot_rev"),
+        pl.col("Units").cast(pl.Float64).sum().alias("tot_units"),
+        pl.col("UnitPrice").cast(pl.Float64).mean().alias("avg_price"),
+    )
+
+    df_clean, prod_df, reg_df, day_df, kpi_df = pl.collect_all(
+        [base, q_prod, q_reg, q_day, q_kpi]
+    )
+
+    # Long ranges are downsampled for the chart (shape preserved by LTTB)
+    if day_df.height > MAX_TREND_POINTS:
+        idx = lttb_indices(
+            day_df["Date"].cast(pl.Int32).to_numpy().astype(np.float64),
+            day_df["Revenue"].to_numpy(),
+            MAX_TREND_POINTS,
+        )
+        day_df = day_df[idx]
+
+    # KPI scalars (including the top product) are cached along with the frames
+    kpis = kpi_df.row(0, named=True)
+    kpis["avg_price"] = kpis["avg_price"] or 0
+    kpis["top_product"] = prod_df["Product"][0] if prod_df.height else "—"
+    kpis["top_product_rev"] = prod_df["Revenue"][0] if prod_df.height else 0
+    return kpis, prod_df, reg_df, day_df, df_clean
+
+@st.cache_data(max_entries=8)
+def make_csv(file_path, xlsx_stamp, region_tuple, product_tuple, start, end):
+    """Encode the filtered rows as CSV (once per filter selection)"""
+    df_clean = compute_views(
+        file_path, xlsx_stamp, region_tuple, product_tuple, start, end
+    )[-1]
+    return df_clean.write_csv().encode("utf-8")
+
 # Reload button
 col1, col2, col3 = st.columns([1, 1, 3])
 with col1:
     if st.button("Reload Data", use_container_width=True):
+        # Always re-parse the workbook, never a previously written copy
+        remove_parquet_copies(excel_file)
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
 
 # Load the data
-df, error = load_data(excel_file)
+xlsx_stamp = source_stamp(excel_file)
+df, error = load_data(excel_file, xlsx_stamp)
 if error:
     st.error(error)
     st.stop()
 
-    # --- Normalize column names (prevents KeyError like 'Date ') ---
-df.columns = df.columns.astype(str).str.strip()
-
-# Optional: make common variations consistent
-rename_map = {}
-for c in df.columns:
-    if c.lower() == "date":
-        rename_map[c] = "Date"
-    elif c.lower() == "units":
-        rename_map[c] = "Units"
-    elif c.lower() in ["unitprice", "unit price"]:
-        rename_map[c] = "UnitPrice"
-    elif c.lower() == "product":
-        rename_map[c] = "Product"
-    elif c.lower() == "region":
-        rename_map[c] = "Region"
-
-df = df.rename(columns=rename_map)
-
-
-# -----------------------------
-# Standardize / clean types
-# -----------------------------
-df["Date"] = pd.to_datetime(df.get("Date"), errors="coerce")
-df["Units"] = pd.to_numeric(df.get("Units"), errors="coerce")
-df["UnitPrice"] = pd.to_numeric(df.get("UnitPrice"), errors="coerce")
-
-# Always calculate Revenue (even if already exists)
-df["Revenue"] = df["Units"] * df["UnitPrice"]
-
-# Drop fully invalid rows early (keeps filters stable)
-df = df.dropna(subset=["Date", "Product", "Region", "Units", "UnitPrice"])
-
 # -----------------------------
 # Filters (clean + safe)
 # -----------------------------
 st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
 st.subheader("Filters")
 
-f1, f2, f3 = st.columns(3)
+regions = df.schema["Region"].categories.to_list()
+products = df.schema["Product"].categories.to_list()
 
-regions = sorted(df["Region"].dropna().unique())
-products = sorted(df["Product"].dropna().unique())
-
-with f1:
-    selected_region = st.multiselect(
-        "Region",
-        regions,
-        default=regions
-    )
+# Filters are a form: changes are applied together on submit (one rerun)
+with st.form("filters"):
+    f1, f2, f3 = st.columns(3)
 
-with f2:
-    selected_product = st.multiselect(
-        "Product",
-        products,
-        default=products
-    )
-
-with f3:
-    min_date = df["Date"].min()
-    max_date = df["Date"].max()
+    with f1:
+        selected_region = st.multiselect(
+            "Region",
+            regions,
+            default=regions
+        )
 
-    # If Date column is empty or invalid, guard
-    if pd.isna(min_date) or pd.isna(max_date):
-        st.warning("No valid dates found in the dataset.")
-        date_range = None
-    else:
-        date_range = st.date_input(
-            "Date Range",
-            value=[min_date.date(), max_date.date()]
+    with f2:
+        selected_product = st.multiselect(
+            "Product",
+            products,
+            default=products
         )
 
-# Apply filters safely (handle empty selections)
-df_filtered = df.copy()
+    with f3:
+        min_date = df["Date"].min()
+        max_date = df["Date"].max()
 
-if selected_region:
-    df_filtered = df_filtered[df_filtered["Region"].isin(selected_region)]
-else:
-    df_filtered = df_filtered.iloc[0:0]  # empty
+        # If Date column is empty or invalid, guard
+        if min_date is None or max_date is None:
+            st.warning("No valid dates found in the dataset.")
+            date_range = None
+        else:
+            date_range = st.date_input(
+                "Date Range",
+                value=[min_date, max_date]
+            )
 
-if selected_product:
-    df_filtered = df_filtered[df_filtered["Product"].isin(selected_product)]
-else:
-    df_filtered = df_filtered.iloc[0:0]  # empty
+    st.form_submit_button("Apply filters")
 
+# Apply filters (cached per selection, so repeating one is a lookup)
 if date_range and len(date_range) == 2:
-    start_date = pd.to_datetime(date_range[0])
-    end_date = pd.to_datetime(date_range[1]) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-    df_filtered = df_filtered[(df_filtered["Date"] >= start_date) & (df_filtered["Date"] <= end_date)]
-
-# Ensure key values exist
-df_clean = df_filtered.dropna(subset=["Revenue"])
+    start_date, end_date = date_range
+else:
+    start_date = end_date = None
+
+filter_args = (
+    excel_file,
+    xlsx_stamp,
+    tuple(sorted(selected_region)),
+    tuple(sorted(selected_product)),
+    start_date,
+    end_date,
+)
+kpis, prod_df, reg_df, day_df, df_clean = compute_views(*filter_args)
 
 # -----------------------------
 # KPI Tiles
@@ -183,131 +409,162 @@ df_clean = df_filtered.dropna(subset=["Revenue"])
 st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
 
 
-# --- KPI Calculations ---
-total_revenue = df_clean["Revenue"].sum()
-total_units = df_clean["Units"].sum()
-avg_unit_price = df_clean["UnitPrice"].mean()
+@st.fragment
+def render_kpis(kpis):
+    """Executive KPI tiles"""
+    st.markdown("### Executive KPIs")
 
-top_product_series = (
-    df_clean.groupby("Product")["Revenue"]
-    .sum()
-    .sort_values(ascending=False)
-)
-
-top_product = top_product_series.index[0] if len(top_product_series) else "—"
-top_product_revenue = top_product_series.iloc[0] if len(top_product_series) else 0
+    k1, k2, k3, k4 = st.columns(4, gap="large")
 
+    with k1:
+        st.metric("Total Revenue", f"${kpis['tot_rev']:,.0f}")
 
-st.markdown("### Executive KPIs")
+    with k2:
+        st.metric("Total Units Sold", f"{kpis['tot_units']:,.0f}")
 
-k1, k2, k3, k4 = st.columns(4, gap="large")
+    with k3:
+        st.metric("Average Unit Price", f"${kpis['avg_price']:,.0f}")
 
-with k1:
-    st.metric("Total Revenue", f"${total_revenue:,.0f}")
-
-with k2:
-    st.metric("Total Units Sold", f"{total_units:,.0f}")
+    with k4:
+        st.metric(
+            "Top Performing Product",
+            kpis["top_product"],
+            f"${kpis['top_product_rev']:,.0f}"
+        )
 
-with k3:
-    st.metric("Average Unit Price", f"${avg_unit_price:,.0f}")
 
-with k4:
-    st.metric("Top Performing Product", top_product, f"${top_product_revenue:,.0f}")
+render_kpis(kpis)
 
 
 # -----------------------------
 # Charts
 # -----------------------------
-st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
-st.subheader("Revenue by Product")
+# Each chart is its own fragment, so interacting with one only reruns that part.
+# Figures are built once per session and kept in st.session_state; later reruns
+# only swap the trace data instead of rebuilding the whole figure
+@st.fragment
+def render_product_chart(prod_df):
+    """Horizontal bar chart of revenue per product"""
+    # Same descending aggregate as the Top Performing Product KPI; a reversed
+    # view gives the ascending order the horizontal bar chart needs
+    rev_by_product = prod_df.reverse().to_pandas()
+
+    fig1 = st.session_state.get("fig_product")
+    if fig1 is None:
+        px.defaults.template = "plotly_white"
+
+        fig1 = px.bar(
+            rev_by_product,
+            x="Revenue",
+            y="Product",
+            orientation="h",
+            text_auto=".2s",
+            color="Revenue",
+            color_continuous_scale="Blues",
+            title=None
+        )
+        fig1.update_layout(
+            showlegend=False,
+            margin=dict(l=10, r=10, t=10, b=10),
+            coloraxis_showscale=False
+        )
+        fig1.update_traces(textposition="outside", cliponaxis=False)
+        st.session_state["fig_product"] = fig1
+    else:
+        fig1.update_traces(
+            x=rev_by_product["Revenue"],
+            y=rev_by_product["Product"],
+            marker_color=rev_by_product["Revenue"]
+        )
 
-if df_clean.empty:
-    st.warning("No chart to display (filtered dataset is empty).")
-else:
-    px.defaults.template = "plotly_white"
+    st.plotly_chart(fig1, use_container_width=True)
 
-    rev_by_product = (
-        df_clean.groupby("Product", as_index=False)["Revenue"]
-        .sum()
-        .sort_values("Revenue", ascending=True)
-    )
 
-    fig1 = px.bar(
-        rev_by_product,
-        x="Revenue",
-        y="Product",
-        orientation="h",
-        text_auto=".2s",
-        color="Revenue",
-        color_continuous_scale="Blues",
-        title=None
-    )
-    fig1.update_layout(
-        showlegend=False,
-        margin=dict(l=10, r=10, t=10, b=10),
-        coloraxis_showscale=False
-    )
-    fig1.update_traces(textposition="outside", cliponaxis=False)
-    st.plotly_chart(fig1, use_container_width=True)
+@st.fragment
+def render_region_chart(reg_df):
+    """Pie chart of revenue share per region"""
+    rev_by_region = reg_df.to_pandas()
 
-    st.subheader("Revenue by Region")
+    fig2 = st.session_state.get("fig_region")
+    if fig2 is None:
+        fig2 = px.pie(
+            rev_by_region,
+            names="Region",
+            values="Revenue",
+            template="plotly_white"
+        )
 
-rev_by_region = (
-    df_clean.groupby("Region", as_index=False)["Revenue"]
-    .sum()
-    .sort_values("Revenue", ascending=False)
-)
+        # Force it to be a normal pie (not donut)
+        fig2.update_traces(
+            hole=0,
+            textposition="inside",
+            textinfo="percent+label"
+        )
 
-fig2 = px.pie(
-    rev_by_region,
-    names="Region",
-    values="Revenue",
-    template="plotly_white"
-)
+        fig2.update_layout(
+            showlegend=True
+        )
+        st.session_state["fig_region"] = fig2
+    else:
+        fig2.update_traces(
+            labels=rev_by_region["Region"],
+            values=rev_by_region["Revenue"]
+        )
 
-# Force it to be a normal pie (not donut)
-fig2.update_traces(
-    hole=0,
-    textposition="inside",
-    textinfo="percent+label"
-)
+    st.plotly_chart(fig2, use_container_width=True)
+
+
+@st.fragment
+def render_daily_chart(day_df):
+    """Daily revenue trend line"""
+    if not day_df.is_empty():
+        # Columns go straight from Arrow to NumPy, no pandas round-trip
+        dates = day_df["Date"].to_numpy()
+        revenue = day_df["Revenue"].to_numpy()
+
+        fig3 = st.session_state.get("fig_daily")
+        if fig3 is None:
+            # WebGL trace: stays responsive when the range covers thousands of days
+            fig3 = go.Figure(
+                go.Scattergl(
+                    x=dates,
+                    y=revenue,
+                    mode="lines+markers",
+                    line=dict(width=3)
+                )
+            )
 
-fig2.update_layout(
-    showlegend=True
-)
+            fig3.update_layout(
+                template="plotly_white",
+                showlegend=False,
+                xaxis_title="Date",
+                yaxis_title="Revenue"
+            )
+            st.session_state["fig_daily"] = fig3
+        else:
+            fig3.update_traces(x=dates, y=revenue)
 
-st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(fig3, use_container_width=True)
+    else:
+        st.info("No data available for selected filters.")
 
-st.subheader("Daily Revenue Trend")
 
-if not df_clean.empty:
+st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
+st.subheader("Revenue by Product")
 
-    # Ensure Date exists and is datetime
-    if "Date" in df_clean.columns:
-        df_clean["Date"] = pd.to_datetime(df_clean["Date"], errors="coerce")
+if df_clean.is_empty():
+    st.warning("No chart to display (filtered dataset is empty).")
+else:
+    render_product_chart(prod_df)
 
-        daily_rev = (
-            df_clean.groupby("Date", as_index=False)["Revenue"]
-            .sum()
-        )
+    st.subheader("Revenue by Region")
 
-        if not daily_rev.empty:
-            fig3 = px.line(
-                daily_rev,
-                x="Date",
-                y="Revenue",
-                markers=True,
-                template="plotly_white"
-            )
+render_region_chart(reg_df)
 
-            fig3.update_traces(line=dict(width=3))
-            fig3.update_layout(showlegend=False)
+st.subheader("Daily Revenue Trend")
 
-            st.plotly_chart(fig3, use_container_width=True)
-        else:
-            st.info("No data available for selected filters.")
-    else:
-        st.info("Date column not available.")
+if not df_clean.is_empty():
+    render_daily_chart(day_df)
 else:
     st.info("No data available for selected filters.")
 
@@ -315,26 +572,42 @@ else:
 # -----------------------------
 # Data preview (filtered + optional CSV download)
 # -----------------------------
+@st.fragment
+def render_data_preview(df_clean, filter_args, n_columns):
+    """Row/column counts, CSV download and a paged table of the filtered rows"""
+    c1, c2, c3 = st.columns([1, 1, 2])
+    with c1:
+        st.metric("Rows (filtered)", df_clean.height)
+    with c2:
+        st.metric("Columns", n_columns)
+
+    with c3:
+        csv = make_csv(*filter_args)
+        st.download_button(
+            "Download filtered data (CSV)",
+            data=csv,
+            file_name="filtered_data.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+    # Only the visible page is sent to the browser; paging reruns just this fragment
+    n_pages = max(1, -(-df_clean.height // PREVIEW_PAGE_SIZE))
+    page = 1
+    if n_pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
+
+    # Streamlit serializes Arrow tables as-is. Enum labels are sent as plain
+    # strings: their uint32 dictionary indices can't be read back into pandas
+    preview = df_clean.slice((page - 1) * PREVIEW_PAGE_SIZE, PREVIEW_PAGE_SIZE)
+    preview = preview.with_columns(pl.col("Region", "Product").cast(pl.String))
+    st.dataframe(preview.to_arrow(), use_container_width=True, height=260)
+
+
 st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
 st.subheader("Data Preview")
 
-c1, c2, c3 = st.columns([1, 1, 2])
-with c1:
-    st.metric("Rows (filtered)", len(df_clean))
-with c2:
-    st.metric("Columns", len(df.columns))
-
-with c3:
-    csv = df_clean.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "Download filtered data (CSV)",
-        data=csv,
-        file_name="filtered_data.csv",
-        mime="text/csv",
-        use_container_width=True
-    )
-
-st.dataframe(df_clean, use_container_width=True, height=260)
+render_data_preview(df_clean, filter_args, len(df.columns))
 
 # Footer
 st.markdown("---")